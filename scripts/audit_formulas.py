@@ -4,19 +4,204 @@ Airtable Formula Auditor
 Automatically identifies formula fields and generates conversion plan
 """
 
+import io
 import os
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Callable, NamedTuple
+from dataclasses import dataclass, asdict
 from pyairtable import Api
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Airtable allows 5 requests/sec per base. Workers only overlap network
+# latency; the request rate itself is capped by RateLimiter below.
+MAX_WORKERS = 5
+MAX_REQUESTS_PER_SECOND = 5
+
+# Detection patterns (compiled once at import)
+EMOJI_RE = re.compile('[✅❌⏳🔴🟢🟡]')
+CONCAT_RE = re.compile(r' - | \| ')
+NAME_HINT_COUNT = re.compile(r'count|total|number|qty|quantity', re.I)
+NAME_HINT_SUM = re.compile(r'total|sum|revenue|amount|avg|average', re.I)
+DURATION_NAMES = frozenset(['nights', 'days', 'duration', 'length'])
+
+# Field types the detector cannot classify; not requested when sampling
+SKIP_FIELD_TYPES = frozenset(['multipleAttachments', 'button', 'barcode'])
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at most max_per_second apart"""
+
+    def __init__(self, max_per_second):
+        self.interval = 1.0 / max_per_second
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call slot is available"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_allowed)
+            self.next_allowed = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass(slots=True)
+class FieldInfo:
+    """Detection result for a single field"""
+    is_computed: bool = False
+    likely_type: str = 'regular_field'
+    pattern: str = ''
+    sample_value: Optional[str] = None
+    postgres_conversion: Optional[str] = None
+
+
+# PostgreSQL conversion SQL by detected field type
+_SQL_TEMPLATES = {
+    'date_diff': """ALTER TABLE {pg_table}
+     ADD COLUMN {pg_field} integer
+     GENERATED ALWAYS AS (
+       EXTRACT(DAY FROM check_out - check_in)
+     ) STORED;""",
+
+    # Guess the linked table from field name
+    'rollup_count': """CREATE VIEW {pg_table}_with_metrics AS
+   SELECT
+     t.*,
+     COUNT(linked.id) as {pg_field}
+   FROM {pg_table} t
+   LEFT JOIN linked_table linked ON linked.{pg_table}_id = t.id
+   GROUP BY t.id;""",
+
+    'rollup_sum': """CREATE VIEW {pg_table}_with_metrics AS
+   SELECT
+     t.*,
+     COALESCE(SUM(linked.amount), 0) as {pg_field}
+   FROM {pg_table} t
+   LEFT JOIN linked_table linked ON linked.{pg_table}_id = t.id
+   GROUP BY t.id;""",
+
+    'conditional_label': """ALTER TABLE {pg_table}
+     ADD COLUMN {pg_field} text
+     GENERATED ALWAYS AS (
+       CASE
+         WHEN status = 'confirmed' THEN '✅ Confirmed'
+         WHEN status = 'pending' THEN '⏳ Pending'
+         ELSE '❌ Other'
+       END
+     ) STORED;""",
+
+    'concatenation': """ALTER TABLE {pg_table}
+     ADD COLUMN {pg_field} text
+     GENERATED ALWAYS AS (
+       field1 || ' - ' || field2
+     ) STORED;""",
+}
+
+
+# Classifications as (is_computed, likely_type, pattern, postgres_conversion)
+_LINKED_RECORD = (False, 'linked_record', 'Linked records (many-to-many)', None)
+_ROLLUP_COUNT = (True, 'rollup_count', 'COUNT of linked records', 'view_with_count')
+_ROLLUP_SUM = (True, 'rollup_sum', 'SUM/AVG of linked records', 'view_with_aggregate')
+_DATE_DIFF = (True, 'date_diff', 'DATETIME_DIFF calculation', 'generated_column')
+_CONCATENATION = (True, 'concatenation', 'String concatenation', 'generated_column')
+_CONDITIONAL_LABEL = (True, 'conditional_label', 'IF/SWITCH conditional', 'generated_column')
+_BOOLEAN_FORMULA = (True, 'boolean_formula', 'Boolean calculation', 'generated_column')
+
+
+class _Sample(NamedTuple):
+    """Inputs to the type handlers for one field"""
+    value: Any
+    name_flags: Dict
+    all_ints: Callable[[], bool]  # lazily checks every non-null value is an int
+
+
+# Type handlers for detect_field_type. Each takes a _Sample and returns a
+# classification tuple, or None if it cannot decide.
+
+def _check_linked(sample):
+    """Check for rollup/lookup patterns (arrays of linked records)"""
+    value = sample.value
+    if value and isinstance(value[0], str) and value[0].startswith('rec'):
+        return _LINKED_RECORD
+    return None
+
+
+def _check_numeric(sample):
+    """Check for numeric aggregations (likely SUM/COUNT/AVG)"""
+    # Check if it looks like a count (integers only, with a name hint)
+    if sample.name_flags['count'] and sample.all_ints():
+        return _ROLLUP_COUNT
+
+    # Check if it looks like a sum/average
+    if sample.name_flags['sum']:
+        return _ROLLUP_SUM
+
+    return None
+
+
+def _check_string(sample):
+    """Check for concatenated strings and emoji status labels"""
+    if CONCAT_RE.search(sample.value):
+        return _CONCATENATION
+
+    if EMOJI_RE.search(sample.value) is not None:
+        return _CONDITIONAL_LABEL
+
+    return None
+
+
+def _check_boolean(sample):
+    """Any bool not already classified is treated as boolean logic"""
+    return _BOOLEAN_FORMULA
+
+
+# Keyed on the exact type so bool does not fall through to int. Checks run
+# before the field-name duration check; bool is numeric here because the
+# original detector treated it as an int subclass.
+_PRE_DURATION_HANDLERS = {
+    list: _check_linked,
+    int: _check_numeric,
+    float: _check_numeric,
+    bool: _check_numeric,
+}
+
+# Checks run after the duration check
+_POST_DURATION_HANDLERS = {
+    str: _check_string,
+    bool: _check_boolean,
+}
+
 
 class FormulaAuditor:
-    def __init__(self, airtable_token, base_id):
+    def __init__(self, airtable_token, base_id, schema=None):
         self.api = Api(airtable_token)
         self.base = self.api.base(base_id)
         self.base_id = base_id
         self.formula_fields = {}
+        self.sql_cache = {}
+
+        # Shared across worker threads so the whole base stays under the limit
+        self.rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+        # Field names worth sampling per table, from the Meta API schema (if available)
+        self.table_fields = {}
+        if schema:
+            for table in schema.get('tables', []):
+                self.table_fields[table['name']] = [
+                    f['name'] for f in table.get('fields', [])
+                    if f.get('type') not in SKIP_FIELD_TYPES
+                ]
 
     def analyze_base(self, table_names: List[str]):
         """Analyze all tables and identify formula fields"""
@@ -25,258 +210,219 @@ class FormulaAuditor:
         print("🔍 AIRTABLE FORMULA AUDITOR")
         print("="*80)
 
-        all_formulas = {}
+        results = {}
 
-        for table_name in table_names:
-            print(f"\n📋 Analyzing table: {table_name}")
-            print("-"*80)
+        # Tables are independent, so fetch them in parallel. Output is
+        # buffered per table and printed once each table completes.
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {}
+            for table_name in table_names:
+                output = []
+                future = executor.submit(self.identify_formula_fields, table_name, output.append)
+                futures[future] = (table_name, output)
 
-            formulas = self.identify_formula_fields(table_name)
-            all_formulas[table_name] = formulas
+            for future in as_completed(futures):
+                table_name, output = futures[future]
+                formulas = future.result()
+                results[table_name] = formulas
 
-            if formulas:
-                print(f"   Found {len(formulas)} computed fields")
-            else:
-                print(f"   No computed fields detected")
+                print(f"\n📋 Analyzing table: {table_name}")
+                print("-"*80)
+                for line in output:
+                    print(line)
+
+                if formulas:
+                    print(f"   Found {len(formulas)} computed fields")
+                else:
+                    print(f"   No computed fields detected")
 
-        return all_formulas
+        # Keep the report in the requested table order
+        return {table_name: results[table_name] for table_name in table_names}
 
-    def identify_formula_fields(self, table_name: str) -> Dict:
+    def identify_formula_fields(self, table_name: str, log=print) -> Dict:
         """Identify formula/computed fields by analyzing data patterns"""
 
         table = self.base.table(table_name)
+        field_names = self.table_fields.get(table_name)
 
-        # Fetch sample records
+        if field_names is not None and not field_names:
+            log(f"   ⚠️  No sampleable fields in {table_name}")
+            return {}
+
+        # Fetch sample records in a single page, skipping unclassifiable fields
         try:
-            records = table.all(max_records=50)
+            self.rate_limiter.wait()
+            if field_names:
+                records = table.all(max_records=50, page_size=50, fields=field_names)
+            else:
+                records = table.all(max_records=50)
         except Exception as e:
-            print(f"   ❌ Error fetching records: {e}")
+            log(f"   ❌ Error fetching records: {e}")
             return {}
 
         if not records:
-            print(f"   ⚠️  No records found in {table_name}")
+            log(f"   ⚠️  No records found in {table_name}")
             return {}
 
-        # Get all field names from first record
-        sample_fields = records[0]['fields']
+        # Without a schema, get all field names from first record
+        if not field_names:
+            field_names = list(records[0]['fields'].keys())
 
         computed_fields = {}
 
-        for field_name in sample_fields.keys():
-            field_type = self.detect_field_type(field_name, records)
-
-            if field_type['is_computed']:
+        for field_name in field_names:
+            # Field-name hints are constant per field, so compute them once here
+            name_lower = field_name.lower()
+            name_flags = {
+                'count': NAME_HINT_COUNT.search(name_lower) is not None,
+                'sum': NAME_HINT_SUM.search(name_lower) is not None,
+                'duration': name_lower in DURATION_NAMES,
+            }
+            field_type = self.detect_field_type(field_name, name_flags, records)
+
+            if field_type.is_computed:
                 computed_fields[field_name] = field_type
-                print(f"   🔸 {field_name:30} → {field_type['likely_type']:20} | {field_type['pattern']}")
+                log(f"   🔸 {field_name:30} → {field_type.likely_type:20} | {field_type.pattern}")
 
         return computed_fields
 
-    def detect_field_type(self, field_name: str, records: List) -> Dict:
-        """Detect if field is computed and what type"""
+    def detect_field_type(self, field_name: str, name_flags: Dict, records: List) -> FieldInfo:
+        """Detect if field is computed and what type
 
-        # Collect all values for this field
-        values = []
-        for record in records:
-            value = record['fields'].get(field_name)
-            if value is not None:
-                values.append(value)
+        name_flags holds the precomputed field-name hints:
+        {'count': bool, 'sum': bool, 'duration': bool}
+        """
 
-        if not values:
-            return {'is_computed': False, 'likely_type': 'unknown'}
+        # Only the first non-null value is needed for most checks
+        sample_value = next(
+            (v for v in (r['fields'].get(field_name) for r in records) if v is not None),
+            None
+        )
 
-        sample_value = values[0]
+        if sample_value is None:
+            return FieldInfo(likely_type='unknown')
 
         # Detection patterns
-        result = {
-            'is_computed': False,
-            'likely_type': 'regular_field',
-            'pattern': '',
-            'sample_value': str(sample_value)[:100] if sample_value else None,
-            'postgres_conversion': None
-        }
-
-        # 1. Check for rollup/lookup patterns (arrays of linked records)
-        if isinstance(sample_value, list) and len(sample_value) > 0:
-            if isinstance(sample_value[0], str) and sample_value[0].startswith('rec'):
-                result['is_computed'] = False
-                result['likely_type'] = 'linked_record'
-                result['pattern'] = 'Linked records (many-to-many)'
-                return result
-
-        # 2. Check for numeric aggregations (likely SUM/COUNT/AVG)
-        if isinstance(sample_value, (int, float)):
-            # Check if it looks like a count (integers only)
-            if all(isinstance(v, int) for v in values):
-                # Check field name for hints
-                if any(word in field_name.lower() for word in ['count', 'total', 'number', 'qty', 'quantity']):
-                    result['is_computed'] = True
-                    result['likely_type'] = 'rollup_count'
-                    result['pattern'] = 'COUNT of linked records'
-                    result['postgres_conversion'] = 'view_with_count'
-                    return result
-
-            # Check if it looks like a sum/average
-            if any(word in field_name.lower() for word in ['total', 'sum', 'revenue', 'amount', 'avg', 'average']):
-                result['is_computed'] = True
-                result['likely_type'] = 'rollup_sum'
-                result['pattern'] = 'SUM/AVG of linked records'
-                result['postgres_conversion'] = 'view_with_aggregate'
-                return result
-
-        # 3. Check for date calculations
-        if field_name.lower() in ['nights', 'days', 'duration', 'length']:
-            result['is_computed'] = True
-            result['likely_type'] = 'date_diff'
-            result['pattern'] = 'DATETIME_DIFF calculation'
-            result['postgres_conversion'] = 'generated_column'
-            return result
-
-        # 4. Check for concatenated strings
-        if isinstance(sample_value, str):
-            # Check if it looks like concatenated values
-            if ' - ' in sample_value or ' | ' in sample_value:
-                result['is_computed'] = True
-                result['likely_type'] = 'concatenation'
-                result['pattern'] = 'String concatenation'
-                result['postgres_conversion'] = 'generated_column'
-                return result
-
-            # Check for status labels with emojis
-            if any(emoji in sample_value for emoji in ['✅', '❌', '⏳', '🔴', '🟢', '🟡']):
-                result['is_computed'] = True
-                result['likely_type'] = 'conditional_label'
-                result['pattern'] = 'IF/SWITCH conditional'
-                result['postgres_conversion'] = 'generated_column'
-                return result
-
-        # 5. Check for boolean logic
-        if isinstance(sample_value, bool):
-            result['is_computed'] = True
-            result['likely_type'] = 'boolean_formula'
-            result['pattern'] = 'Boolean calculation'
-            result['postgres_conversion'] = 'generated_column'
-            return result
+        result = FieldInfo(sample_value=str(sample_value)[:100] if sample_value else None)
+
+        def all_ints():
+            return all(
+                isinstance(r['fields'].get(field_name), int)
+                for r in records
+                if r['fields'].get(field_name) is not None
+            )
+
+        sample = _Sample(sample_value, name_flags, all_ints)
+        sample_type = type(sample_value)
+
+        # Check order: type-specific checks, then the field-name duration
+        # hint, then the remaining value checks
+        handler = _PRE_DURATION_HANDLERS.get(sample_type)
+        match = handler(sample) if handler else None
+
+        if match is None and name_flags['duration']:
+            match = _DATE_DIFF
+
+        if match is None:
+            handler = _POST_DURATION_HANDLERS.get(sample_type)
+            match = handler(sample) if handler else None
+
+        if match is not None:
+            result.is_computed, result.likely_type, result.pattern, result.postgres_conversion = match
 
         return result
 
     def generate_conversion_plan(self, all_formulas: Dict) -> str:
         """Generate detailed conversion plan"""
 
-        plan = []
-        plan.append("\n" + "="*80)
-        plan.append("📋 FORMULA CONVERSION PLAN")
-        plan.append("="*80)
+        # Build into a single buffer; w() avoids attribute lookups in the loops
+        buf = io.StringIO()
+        w = buf.write
+
+        w(f"\n{'='*80}\n")
+        w("📋 FORMULA CONVERSION PLAN\n")
+        w(f"{'='*80}\n")
 
         # Count by type
         type_counts = defaultdict(int)
         for table_name, formulas in all_formulas.items():
             for field_name, field_info in formulas.items():
-                type_counts[field_info['likely_type']] += 1
+                type_counts[field_info.likely_type] += 1
 
-        plan.append("\n📊 SUMMARY:")
-        plan.append(f"   Total computed fields: {sum(type_counts.values())}")
+        w("\n📊 SUMMARY:\n")
+        w(f"   Total computed fields: {sum(type_counts.values())}\n")
         for field_type, count in sorted(type_counts.items()):
-            plan.append(f"   - {field_type}: {count}")
+            w(f"   - {field_type}: {count}\n")
 
         # Detailed conversion for each table
         for table_name, formulas in all_formulas.items():
             if not formulas:
                 continue
 
-            plan.append(f"\n\n{'='*80}")
-            plan.append(f"📋 TABLE: {table_name}")
-            plan.append('='*80)
+            w(f"\n\n{'='*80}\n")
+            w(f"📋 TABLE: {table_name}\n")
+            w(f"{'='*80}\n")
 
             for field_name, field_info in formulas.items():
-                plan.append(f"\n🔸 {field_name}")
-                plan.append(f"   Type: {field_info['likely_type']}")
-                plan.append(f"   Pattern: {field_info['pattern']}")
-                plan.append(f"   Sample: {field_info['sample_value']}")
-                plan.append(f"   Strategy: {field_info['postgres_conversion'] or 'manual_review'}")
+                w(f"\n🔸 {field_name}\n")
+                w(f"   Type: {field_info.likely_type}\n")
+                w(f"   Pattern: {field_info.pattern}\n")
+                w(f"   Sample: {field_info.sample_value}\n")
+                w(f"   Strategy: {field_info.postgres_conversion or 'manual_review'}\n")
 
                 # Generate SQL suggestion
-                sql = self.suggest_postgres_conversion(
+                sql = self.get_postgres_conversion(
                     table_name,
                     field_name,
                     field_info
                 )
                 if sql:
-                    plan.append(f"\n   SQL Suggestion:")
+                    w(f"\n   SQL Suggestion:\n")
                     for line in sql.split('\n'):
-                        plan.append(f"   {line}")
+                        w(f"   {line}\n")
 
         # Action items
-        plan.append("\n\n" + "="*80)
-        plan.append("✅ ACTION ITEMS:")
-        plan.append("="*80)
-        plan.append("\n1. REVIEW: Manually verify detected formulas in Airtable UI")
-        plan.append("2. MIGRATE: Store computed values during initial migration")
-        plan.append("3. IMPLEMENT: Add PostgreSQL generated columns/views")
-        plan.append("4. VERIFY: Compare Airtable vs PostgreSQL results")
-        plan.append("5. CLEANUP: Remove snapshot fields once verified")
-
-        return '\n'.join(plan)
-
-    def suggest_postgres_conversion(self, table_name: str, field_name: str, field_info: Dict) -> str:
+        w(f"\n\n{'='*80}\n")
+        w("✅ ACTION ITEMS:\n")
+        w(f"{'='*80}\n")
+        w("\n1. REVIEW: Manually verify detected formulas in Airtable UI\n")
+        w("2. MIGRATE: Store computed values during initial migration\n")
+        w("3. IMPLEMENT: Add PostgreSQL generated columns/views\n")
+        w("4. VERIFY: Compare Airtable vs PostgreSQL results\n")
+        w("5. CLEANUP: Remove snapshot fields once verified\n")
+
+        return buf.getvalue()
+
+    def get_postgres_conversion(self, table_name: str, field_name: str, field_info: FieldInfo) -> Optional[str]:
+        """Return the PostgreSQL conversion SQL, generating it only once per field"""
+
+        key = (table_name, field_name, field_info.likely_type)
+        if key not in self.sql_cache:
+            self.sql_cache[key] = self.suggest_postgres_conversion(table_name, field_name, field_info)
+        return self.sql_cache[key]
+
+    def suggest_postgres_conversion(self, table_name: str, field_name: str, field_info: FieldInfo) -> Optional[str]:
         """Generate PostgreSQL conversion SQL"""
 
-        pg_table = table_name.lower()
-        pg_field = field_name.lower().replace(' ', '_').replace('#', 'num')
-
-        field_type = field_info['likely_type']
-
-        if field_type == 'date_diff':
-            return f"""ALTER TABLE {pg_table}
-     ADD COLUMN {pg_field} integer
-     GENERATED ALWAYS AS (
-       EXTRACT(DAY FROM check_out - check_in)
-     ) STORED;"""
-
-        elif field_type == 'rollup_count':
-            # Guess the linked table from field name
-            return f"""CREATE VIEW {pg_table}_with_metrics AS
-   SELECT
-     t.*,
-     COUNT(linked.id) as {pg_field}
-   FROM {pg_table} t
-   LEFT JOIN linked_table linked ON linked.{pg_table}_id = t.id
-   GROUP BY t.id;"""
-
-        elif field_type == 'rollup_sum':
-            return f"""CREATE VIEW {pg_table}_with_metrics AS
-   SELECT
-     t.*,
-     COALESCE(SUM(linked.amount), 0) as {pg_field}
-   FROM {pg_table} t
-   LEFT JOIN linked_table linked ON linked.{pg_table}_id = t.id
-   GROUP BY t.id;"""
-
-        elif field_type == 'conditional_label':
-            return f"""ALTER TABLE {pg_table}
-     ADD COLUMN {pg_field} text
-     GENERATED ALWAYS AS (
-       CASE
-         WHEN status = 'confirmed' THEN '✅ Confirmed'
-         WHEN status = 'pending' THEN '⏳ Pending'
-         ELSE '❌ Other'
-       END
-     ) STORED;"""
-
-        elif field_type == 'concatenation':
-            return f"""ALTER TABLE {pg_table}
-     ADD COLUMN {pg_field} text
-     GENERATED ALWAYS AS (
-       field1 || ' - ' || field2
-     ) STORED;"""
+        template = _SQL_TEMPLATES.get(field_info.likely_type)
+        if template is None:
+            return None
 
-        return None
+        return template.format(
+            pg_table=table_name.lower(),
+            pg_field=field_name.lower().replace(' ', '_').replace('#', 'num')
+        )
 
     def export_report(self, all_formulas: Dict, plan: str):
         """Export detailed JSON report and plan"""
 
         # Export JSON
-        with open('airtable_formulas.json', 'w') as f:
-            json.dump(all_formulas, indent=2, fp=f)
+        if orjson is not None:
+            with open('airtable_formulas.json', 'wb') as f:
+                f.write(orjson.dumps(all_formulas, option=orjson.OPT_INDENT_2))
+        else:
+            with open('airtable_formulas.json', 'w') as f:
+                json.dump(all_formulas, indent=2, fp=f, default=asdict)
         print("\n✅ Detailed report saved: airtable_formulas.json")
 
         # Export plan
@@ -284,23 +430,18 @@ class FormulaAuditor:
             f.write(plan)
         print("✅ Conversion plan saved: conversion_plan.txt")
 
-        # Export SQL template
-        sql_lines = []
-        sql_lines.append("-- Airtable Formula Conversion SQL")
-        sql_lines.append("-- Generated automatically - REVIEW BEFORE RUNNING\n")
-
-        for table_name, formulas in all_formulas.items():
-            sql_lines.append(f"\n-- {table_name}")
-            sql_lines.append("-" * 60)
+        # Export SQL template (written straight to a large file buffer)
+        with open('formula_conversion.sql', 'w', buffering=1 << 20) as f:
+            f.write("-- Airtable Formula Conversion SQL\n"
+                    "-- Generated automatically - REVIEW BEFORE RUNNING\n\n")
 
-            for field_name, field_info in formulas.items():
-                sql = self.suggest_postgres_conversion(table_name, field_name, field_info)
-                if sql:
-                    sql_lines.append(f"\n-- {field_name}")
-                    sql_lines.append(sql)
+            for table_name, formulas in all_formulas.items():
+                f.write(f"\n-- {table_name}\n{'-' * 60}\n")
 
-        with open('formula_conversion.sql', 'w') as f:
-            f.write('\n'.join(sql_lines))
+                for field_name, field_info in formulas.items():
+                    sql = self.get_postgres_conversion(table_name, field_name, field_info)
+                    if sql:
+                        f.write(f"\n-- {field_name}\n{sql}\n")
         print("✅ SQL template saved: formula_conversion.sql")
 
 
@@ -324,12 +465,14 @@ def main():
     #     'Transactions',
     # ]
 
+    schema = None
+
     # Auto-discover if not specified
     if TABLE_NAMES is None:
         print("🔍 Auto-discovering tables...")
         try:
             from list_tables import list_tables
-            TABLE_NAMES = list_tables(BASE_ID, AIRTABLE_TOKEN, verbose=False)
+            TABLE_NAMES, schema = list_tables(BASE_ID, AIRTABLE_TOKEN, verbose=False, return_schema=True)
             print(f"✅ Found {len(TABLE_NAMES)} tables: {', '.join(TABLE_NAMES)}\n")
         except Exception as e:
             print(f"❌ Auto-discovery failed: {e}")
@@ -341,7 +484,7 @@ def main():
     print(f"   Tables: {', '.join(TABLE_NAMES)}")
     print()
 
-    auditor = FormulaAuditor(AIRTABLE_TOKEN, BASE_ID)
+    auditor = FormulaAuditor(AIRTABLE_TOKEN, BASE_ID, schema=schema)
 
     # Analyze all tables
     all_formulas = auditor.analyze_base(TABLE_NAMES)
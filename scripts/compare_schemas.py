@@ -6,57 +6,71 @@ Compare two Airtable schemas and detect changes
 import json
 import sys
 
+def load_schema(schema_path):
+    """Load a schema file, interning table and field IDs
+
+    IDs repeat across the old and new schema, so interning them lets
+    the diff's dict lookups compare by identity.
+    """
+
+    with open(schema_path) as f:
+        schema = json.load(f)
+
+    for table in schema.get('tables', []):
+        table['id'] = sys.intern(table['id'])
+        for field in table.get('fields', []):
+            field['id'] = sys.intern(field['id'])
+
+    return schema
+
+
 def compare_schemas(old_schema_path, new_schema_path):
     """Compare two schema files and report differences"""
 
-    with open(old_schema_path) as f:
-        old_schema = json.load(f)
-
-    with open(new_schema_path) as f:
-        new_schema = json.load(f)
+    old_schema = load_schema(old_schema_path)
+    new_schema = load_schema(new_schema_path)
 
     old_tables = {t['id']: t for t in old_schema.get('tables', [])}
     new_tables = {t['id']: t for t in new_schema.get('tables', [])}
 
     changes = []
+    field_changes = []
 
-    # Check for new tables
-    for table_id, table in new_tables.items():
-        if table_id not in old_tables:
-            changes.append(f"➕ NEW TABLE: {table['name']}")
-
-    # Check for removed tables
-    for table_id, table in old_tables.items():
-        if table_id not in new_tables:
-            changes.append(f"➖ REMOVED TABLE: {table['name']}")
-
-    # Check for field changes in existing tables
-    for table_id in set(old_tables.keys()) & set(new_tables.keys()):
-        old_table = old_tables[table_id]
-        new_table = new_tables[table_id]
+    # Single pass over the new schema: new tables, plus field diffs for
+    # tables present in both (dict lookups, no temporary sets)
+    for table_id, new_table in new_tables.items():
+        old_table = old_tables.get(table_id)
+        if old_table is None:
+            changes.append(f"➕ NEW TABLE: {new_table['name']}")
+            continue
 
         old_fields = {f['id']: f for f in old_table.get('fields', [])}
         new_fields = {f['id']: f for f in new_table.get('fields', [])}
 
         table_name = new_table['name']
+        type_changes = []
 
-        # New fields
-        for field_id, field in new_fields.items():
-            if field_id not in old_fields:
-                changes.append(f"   ➕ {table_name}: New field '{field['name']}' ({field['type']})")
+        # New fields and changed field types
+        for field_id, new_field in new_fields.items():
+            old_field = old_fields.get(field_id)
+            if old_field is None:
+                field_changes.append(f"   ➕ {table_name}: New field '{new_field['name']}' ({new_field['type']})")
+            elif old_field['type'] != new_field['type']:
+                type_changes.append(f"   🔄 {table_name}: '{new_field['name']}' type changed: {old_field['type']} → {new_field['type']}")
 
         # Removed fields
-        for field_id, field in old_fields.items():
+        for field_id, old_field in old_fields.items():
             if field_id not in new_fields:
-                changes.append(f"   ➖ {table_name}: Removed field '{field['name']}'")
+                field_changes.append(f"   ➖ {table_name}: Removed field '{old_field['name']}'")
 
-        # Changed field types
-        for field_id in set(old_fields.keys()) & set(new_fields.keys()):
-            old_field = old_fields[field_id]
-            new_field = new_fields[field_id]
+        field_changes.extend(type_changes)
+
+    # Check for removed tables
+    for table_id, old_table in old_tables.items():
+        if table_id not in new_tables:
+            changes.append(f"➖ REMOVED TABLE: {old_table['name']}")
 
-            if old_field['type'] != new_field['type']:
-                changes.append(f"   🔄 {table_name}: '{new_field['name']}' type changed: {old_field['type']} → {new_field['type']}")
+    changes.extend(field_changes)
 
     if changes:
         print("\n".join(changes))
@@ -3,40 +3,103 @@
 Export dashboard data as JSON for Netlify functions
 """
 
+import sys
 import json
 import argparse
 from pathlib import Path
 from datetime import datetime
 
-def export_data(output_file):
-    """Export dashboard data to JSON"""
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-    # Load audit data - search in subdirectories
-    formulas = []
-    audit_file = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Audit field keys, looked up once per exported field
+_LIKELY_TYPE = sys.intern('likely_type')
+_PATTERN = sys.intern('pattern')
+_SAMPLE = sys.intern('sample_value')
+
+# Audit files larger than this are streamed with ijson
+STREAM_THRESHOLD = 100 * 1024 * 1024
+
+
+def iter_audit_tables(audit_file):
+    """Yield (table_name, fields) pairs from the audit file"""
+    audit_file = Path(audit_file)
+
+    # Stream very large files table-by-table instead of loading them whole
+    if ijson is not None and audit_file.stat().st_size > STREAM_THRESHOLD:
+        with open(audit_file, 'rb') as f:
+            yield from ijson.kvitems(f, '', use_float=True)
+    elif orjson is not None:
+        # Parse the raw UTF-8 bytes directly, skipping the text decode
+        yield from orjson.loads(audit_file.read_bytes()).items()
+    else:
+        with open(audit_file, 'rb') as f:
+            yield from json.load(f).items()
+
+
+def find_audit_file(audit_dir=Path('./data/audit')):
+    """Locate airtable_formulas.json, checking the default location before searching"""
+
+    fixed_path = audit_dir / 'airtable_formulas.json'
+    if fixed_path.exists():
+        return fixed_path
 
-    # Find the audit data file (it's extracted into a subdirectory)
-    audit_dir = Path('./data/audit')
+    # The audit artifact is usually extracted into a subdirectory
     if audit_dir.exists():
-        # Look for airtable_formulas.json in subdirectories
         for json_file in audit_dir.rglob('airtable_formulas.json'):
-            audit_file = json_file
-            break
+            return json_file
+
+    return None
+
+
+def load_audit_formulas(audit_file):
+    """Flatten the audit file into (formulas, table_names)"""
+
+    formulas = []
+    table_names = set()
+
+    for table_name, fields in iter_audit_tables(audit_file):
+        if fields:
+            table_names.add(table_name)
+
+        for field_name, field_info in fields.items():
+            sv = field_info.get(_SAMPLE)
+            if isinstance(sv, str):
+                sample = sv[:100]
+            else:
+                sample = '' if sv is None else str(sv)[:100]
+
+            formulas.append({
+                'table': table_name,
+                'field': field_name,
+                'type': field_info.get(_LIKELY_TYPE),
+                'pattern': field_info.get(_PATTERN),
+                'sample': sample
+            })
+
+    return formulas, table_names
+
+
+def export_data(output_file, audit_path=None):
+    """Export dashboard data to JSON"""
+
+    # Load audit data
+    formulas = []
+    table_names = set()
+    audit_file = Path(audit_path) if audit_path else find_audit_file()
 
     if audit_file and audit_file.exists():
         try:
-            with open(audit_file) as f:
-                data = json.load(f)
-
-                for table_name, fields in data.items():
-                    for field_name, field_info in fields.items():
-                        formulas.append({
-                            'table': table_name,
-                            'field': field_name,
-                            'type': field_info.get('likely_type'),
-                            'pattern': field_info.get('pattern'),
-                            'sample': str(field_info.get('sample_value', ''))[:100]
-                        })
+            # Only adopt the results once the whole file has parsed, so a
+            # streaming error part-way through never exports partial data
+            formulas, table_names = load_audit_formulas(audit_file)
             print(f"✅ Loaded audit data from {audit_file}")
         except Exception as e:
             print(f"⚠️  Error loading audit data: {e}")
@@ -55,7 +118,7 @@ def export_data(output_file):
 
     # Build stats
     stats = {
-        'total_tables': len(set(f['table'] for f in formulas)),
+        'total_tables': len(table_names),
         'formula_count': len(formulas),
         'last_sync_records': sync_history[0]['records'] if sync_history else 0,
         'last_sync_date': sync_history[0]['date'] if sync_history else None,
@@ -72,8 +135,12 @@ def export_data(output_file):
         'last_updated': datetime.now().isoformat()
     }
 
-    with open(output_file, 'w') as f:
-        json.dump(output, indent=2, fp=f)
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(output, indent=2, fp=f)
 
     print(f"✅ Exported dashboard data to {output_file}")
     print(f"   Stats: {stats}")
@@ -83,9 +150,15 @@ def export_data(output_file):
 def main():
     parser = argparse.ArgumentParser(description='Export dashboard data')
     parser.add_argument('--output', default='./dashboard-data.json')
+    parser.add_argument('--audit-path', default=None,
+                        help='Path to airtable_formulas.json (default: search ./data/audit)')
     args = parser.parse_args()
 
-    export_data(args.output)
+    # An explicit path must exist; only the default search may find nothing
+    if args.audit_path and not Path(args.audit_path).is_file():
+        parser.error(f"audit file not found: {args.audit_path}")
+
+    export_data(args.output, args.audit_path)
 
 if __name__ == '__main__':
     main()
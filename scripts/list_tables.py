@@ -8,13 +8,42 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared session so repeated Meta API calls reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+))
+
+# Successful schema responses, keyed by (base_id, token)
+_SCHEMA_CACHE = {}
 
 def get_base_schema(base_id, token):
     """
     Get base schema using Airtable Meta API
     https://airtable.com/developers/web/api/get-base-schema
+
+    Results are cached per (base_id, token); failed lookups are not cached.
     """
 
+    cache_key = (base_id, token)
+    if cache_key in _SCHEMA_CACHE:
+        return _SCHEMA_CACHE[cache_key]
+
     url = f"https://api.airtable.com/v0/meta/bases/{base_id}/tables"
 
     headers = {
@@ -23,9 +52,11 @@ def get_base_schema(base_id, token):
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        return response.json()
+        schema = response.json()
+        _SCHEMA_CACHE[cache_key] = schema
+        return schema
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 403:
             print("❌ Error: Permission denied")
@@ -42,8 +73,13 @@ def get_base_schema(base_id, token):
         return None
 
 
-def list_tables(base_id, token, verbose=True):
-    """List all tables in the base"""
+def list_tables(base_id, token, verbose=True, return_schema=False):
+    """
+    List all tables in the base
+
+    With return_schema=True, returns (table_names, schema) so callers
+    can reuse the fetched schema instead of requesting it again.
+    """
 
     if verbose:
         print("="*80)
@@ -55,7 +91,7 @@ def list_tables(base_id, token, verbose=True):
     schema = get_base_schema(base_id, token)
 
     if not schema or 'tables' not in schema:
-        return []
+        return ([], schema) if return_schema else []
 
     tables = schema['tables']
 
@@ -72,7 +108,12 @@ def list_tables(base_id, token, verbose=True):
 
         print("-"*80)
 
-    return [table['name'] for table in tables]
+    table_names = [table['name'] for table in tables]
+
+    if return_schema:
+        return table_names, schema
+
+    return table_names
 
 
 def generate_table_names_list(tables):
@@ -136,8 +177,12 @@ def generate_detailed_schema(base_id, token):
                     print(f"    Formula: {formula[:100]}...")
 
     # Save to JSON
-    with open('airtable_schema.json', 'w') as f:
-        json.dump(schema, indent=2, fp=f)
+    if orjson is not None:
+        with open('airtable_schema.json', 'wb') as f:
+            f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+    else:
+        with open('airtable_schema.json', 'w') as f:
+            json.dump(schema, indent=2, fp=f)
 
     print("\n" + "="*80)
     print("✅ Full schema saved to: airtable_schema.json")